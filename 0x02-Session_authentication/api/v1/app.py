@@ -3,10 +3,12 @@ from flask import Flask, jsonify, request, abort
 from api.v1.auth.auth import Auth
 from api.v1.auth.basic_auth import BasicAuth
 from api.v1.auth.session_auth import SessionAuth
+from api.v1 import profiler
 import os
 
 app = Flask(__name__)
 auth = None
+profiler.init_app(app)
 
 # Initialize authentication type based on environment variable
 AUTH_TYPE = os.getenv("AUTH_TYPE")
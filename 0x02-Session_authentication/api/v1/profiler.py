@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Sampling profiler module.
+
+A background thread periodically captures the stacks of the threads that
+are serving profiled requests and aggregates them in collapsed format
+("frame;frame;frame count" lines), ready for flamegraph.pl or speedscope.
+Requests are profiled while a time window is open, for a random fraction
+of requests, or when they carry the profiler token in PROFILE_HEADER.
+While none of this is enabled the request hooks return after a couple of
+comparisons and the sampler thread sleeps.
+
+Profiler state lives in each process: under a multi-worker server, the
+admin endpoint starts, reads and resets the profiler of whichever worker
+serves the call, and the header only profiles the request carrying it.
+
+This module is duplicated in 0x02-Session_authentication/api/v1/ and
+0x03-user_authentication_service/, which have separate import roots;
+keep both copies in sync.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from flask import Flask, abort, request
+
+PROFILE_HEADER = 'X-Profile-Token'
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 300
+
+
+class SamplingProfiler:
+    """Statistical profiler of Flask request threads."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL,
+                 token: Optional[str] = None):
+        """Initialize an idle profiler sampling every interval seconds."""
+        self.interval = interval
+        self.token = token
+        self.rate = 0.0
+        self.until = 0.0
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._threads: Dict[int, bool] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self, seconds: float = 0, rate: float = 0) -> None:
+        """Profile every request for seconds, and a rate of them after."""
+        self.until = time.monotonic() + min(seconds, MAX_SECONDS)
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._ensure_sampler()
+
+    def stop(self) -> None:
+        """Stop profiling new requests."""
+        self.until = 0.0
+        self.rate = 0.0
+
+    def reset(self) -> None:
+        """Drop the stacks collected so far."""
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def collapsed(self) -> str:
+        """Return the collected stacks in collapsed format."""
+        with self._lock:
+            return ''.join(f"{stack} {count}\n"
+                           for stack, count in self._stacks.most_common())
+
+    def wants(self, headers) -> bool:
+        """Tell whether the request with these headers is to be profiled."""
+        if self.until > time.monotonic():
+            return True
+        if self.rate and random.random() < self.rate:
+            return True
+        return self.authorized(headers)
+
+    def authorized(self, headers) -> bool:
+        """Tell whether these headers carry the profiler token."""
+        value = headers.get(PROFILE_HEADER)
+        if not self.token or value is None:
+            return False
+        return hmac.compare_digest(value.encode('utf-8'),
+                                   self.token.encode('utf-8'))
+
+    def enter(self) -> None:
+        """Start sampling the current thread."""
+        self._ensure_sampler()
+        self._threads[threading.get_ident()] = True
+        self._wake.set()
+
+    def leave(self) -> None:
+        """Stop sampling the current thread."""
+        self._threads.pop(threading.get_ident(), None)
+
+    def _ensure_sampler(self) -> None:
+        """Start the sampler thread if it is not running yet."""
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._run, name='sampling-profiler', daemon=True)
+                self._sampler.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        """Sampler loop, sleeping while there is nothing to sample."""
+        while True:
+            if not self._threads and self.until <= time.monotonic():
+                self._wake.clear()
+                if not self._threads:
+                    self._wake.wait()
+                continue
+            self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self) -> None:
+        """Record the current stack of every profiled thread."""
+        frames = sys._current_frames()
+        stacks = []
+        for ident in list(self._threads):
+            frame = frames.get(ident)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}"
+                             f":{code.co_name}")
+                frame = frame.f_back
+            if names:
+                stacks.append(';'.join(reversed(names)))
+        with self._lock:
+            self._stacks.update(stacks)
+            self.samples += 1
+
+
+def init_app(app: Flask, profiler: Optional[SamplingProfiler] = None
+             ) -> SamplingProfiler:
+    """Install the request hooks and the /admin/profiler endpoint.
+
+    The endpoint only exists when PROFILER_TOKEN is configured, and every
+    call must send the token in PROFILE_HEADER:
+    POST with seconds and/or rate starts profiling, GET returns the
+    collapsed stacks and DELETE stops profiling and drops them.
+    """
+    if profiler is None:
+        profiler = SamplingProfiler(
+            token=app.config.get('PROFILER_TOKEN')
+            or os.getenv('PROFILER_TOKEN'))
+    app.extensions['profiler'] = profiler
+
+    @app.before_request
+    def profile_request():
+        """Starts sampling the request thread if it is profiled"""
+        if profiler.wants(request.headers):
+            profiler.enter()
+
+    @app.teardown_request
+    def end_profile_request(exception=None):
+        """Stops sampling the request thread"""
+        profiler.leave()
+
+    if not profiler.token:
+        return profiler
+
+    def admin_profiler():
+        """Controls the profiler and serves the collapsed stacks"""
+        if not profiler.authorized(request.headers):
+            abort(403)
+        if request.method == 'POST':
+            try:
+                seconds = float(request.form.get('seconds', 0))
+                rate = float(request.form.get('rate', 0))
+            except ValueError:
+                abort(400)
+            profiler.start(seconds, rate)
+        elif request.method == 'DELETE':
+            profiler.stop()
+            profiler.reset()
+        return app.response_class(profiler.collapsed(), mimetype='text/plain')
+
+    app.add_url_rule('/admin/profiler', 'admin_profiler', admin_profiler,
+                     methods=['GET', 'POST', 'DELETE'])
+    return profiler
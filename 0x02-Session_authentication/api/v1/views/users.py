@@ -1,12 +1,94 @@
 #!/usr/bin/env python3
-from flask import jsonify, abort, request
+from datetime import datetime
+from flask import abort, current_app, request, stream_with_context
+from models.base import INDEXED_ATTRIBUTES, TIMESTAMP_FORMAT, dumps
 from models.user import User
 from api.v1.views import app_views
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _parse_timestamp(value):
+    """Parses an optional timestamp query parameter"""
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        abort(400)
+
+
+def _encode_cursor(user, order_by):
+    """Returns the cursor resuming right after a user"""
+    value = getattr(user, order_by).strftime(TIMESTAMP_FORMAT)
+    return f"{value}|{user.id}"
+
+
+def _decode_cursor(cursor):
+    """Returns the (value, id) index key of a cursor"""
+    if cursor is None:
+        return None
+    value, _, user_id = cursor.partition('|')
+    return _parse_timestamp(value), user_id
+
+
+@app_views.route('/users', methods=['GET'], strict_slashes=False)
+def view_all_users():
+    """Returns one page of users ordered by created_at or updated_at
+
+    Query parameters: order_by, start and end (timestamps, end excluded),
+    cursor (next_cursor of the previous page), limit, and stream=1 to get
+    every remaining user as newline-delimited JSON instead of a page.
+    Only authenticated users may list users.
+    """
+    if getattr(request, 'current_user', None) is None:
+        abort(401)
+    order_by = request.args.get('order_by', 'created_at')
+    if order_by not in INDEXED_ATTRIBUTES:
+        abort(400)
+    users = User.search_range(
+        order_by,
+        start=_parse_timestamp(request.args.get('start')),
+        end=_parse_timestamp(request.args.get('end')),
+        after=_decode_cursor(request.args.get('cursor'))
+    )
+
+    if request.args.get('stream') == '1':
+        def generate():
+            for user in users:
+                yield user.to_json_bytes() + b'\n'
+        return current_app.response_class(
+            stream_with_context(generate()),
+            mimetype='application/x-ndjson'
+        )
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        abort(400)
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        abort(400)
+
+    page = []
+    for user in users:
+        page.append(user)
+        if len(page) == limit:
+            break
+    next_cursor = None
+    if len(page) == limit:
+        next_cursor = _encode_cursor(page[-1], order_by)
+    body = b'{"users":[' + b','.join(user.to_json_bytes() for user in page) \
+        + b'],"next_cursor":' + dumps(next_cursor) + b'}'
+    return current_app.response_class(body, mimetype='application/json')
+
 
 @app_views.route('/users/me', methods=['GET'], strict_slashes=False)
 def get_authenticated_user():
     """Returns the authenticated user's data"""
     if request.current_user is None:
         abort(404)
-    return jsonify(request.current_user.to_dict())
+    return current_app.response_class(
+        request.current_user.to_json_bytes(),
+        mimetype='application/json'
+    )
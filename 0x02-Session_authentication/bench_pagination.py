@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark of cursor pagination over the created_at index at various depths
+"""
+import os
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from itertools import islice
+
+from models.base import DATA
+from models.user import User
+
+USERS = 100000
+PAGE_SIZE = 100
+REPEAT = 5
+
+
+def page_after(after):
+    """Materialize one page of users starting after an index key"""
+    return list(islice(User.search_range('created_at', after=after),
+                       PAGE_SIZE))
+
+
+def legacy_page(after):
+    """Sort the whole store and slice, as a plain Base.all() listing would"""
+    users = sorted(User.all(), key=lambda user: (user.created_at, user.id))
+    return [user for user in users
+            if (user.created_at, user.id) > after][:PAGE_SIZE]
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    origin = datetime(2024, 1, 1)
+    DATA['User'] = {}
+    for i in range(USERS):
+        user = User(email=f"user{i}@holberton.io",
+                    created_at=(origin + timedelta(seconds=i))
+                    .strftime("%Y-%m-%dT%H:%M:%S"))
+        DATA['User'][user.id] = user
+    User.save_to_file()
+    User.load_from_file()
+
+    ordered = list(User.search_range('created_at'))
+    assert len(ordered) == USERS
+    for depth in (0, USERS // 100, USERS // 2, USERS - PAGE_SIZE - 1):
+        last = ordered[depth]
+        after = (last.created_at, last.id)
+        assert page_after(after) == legacy_page(after)
+        indexed = min(timeit.repeat(lambda: page_after(after),
+                                    number=100, repeat=REPEAT)) / 100
+        full = min(timeit.repeat(lambda: legacy_page(after),
+                                 number=1, repeat=REPEAT))
+        print(f"depth {depth:>6}: indexed {indexed * 1e6:8.1f} us, "
+              f"full scan {full * 1e3:8.1f} ms")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark of user serialization: the `/users/me` payload and full-store dumps
+"""
+import json
+import os
+import tempfile
+import timeit
+
+from models.base import DATA, TIMESTAMP_FORMAT
+from models.user import User
+
+USERS = 10000
+REPEAT = 5
+
+
+def legacy_me(user: User) -> bytes:
+    """Encode the `/users/me` payload the way jsonify(to_json()) did"""
+    return json.dumps(user.to_json()).encode('utf-8')
+
+
+def legacy_save_to_file() -> None:
+    """Dump the store the way save_to_file did before caching"""
+    with open(User._get_file_path(), 'w') as file:
+        json.dump({obj.id: obj.to_json(True)
+                   for obj in DATA['User'].values()}, file)
+
+
+def best(stmt, number: int) -> float:
+    """Best per-call time in microseconds"""
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT)) \
+        / number * 1e6
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    DATA['User'] = {}
+    for i in range(USERS):
+        user = User(email=f"user{i}@holberton.io",
+                    first_name="Bob", last_name=f"Dylan{i}")
+        user.password = "H0lbertonSchool98!"
+        DATA['User'][user.id] = user
+
+    me = next(iter(DATA['User'].values()))
+    print(f"/users/me  legacy: {best(lambda: legacy_me(me), 20000):8.2f} us")
+    print(f"/users/me  cached: "
+          f"{best(lambda: me.to_json_bytes(), 20000):8.2f} us")
+
+    User.save_to_file()
+    print(f"dump {USERS} legacy: "
+          f"{best(legacy_save_to_file, 5) / 1e3:8.2f} ms")
+    print(f"dump {USERS} cached: "
+          f"{best(User.save_to_file, 5) / 1e3:8.2f} ms")
+
+    User.load_from_file()
+    assert len(DATA['User']) == USERS
+    assert User.get(me.id).created_at.strftime(TIMESTAMP_FORMAT) \
+        == me.created_at.strftime(TIMESTAMP_FORMAT)
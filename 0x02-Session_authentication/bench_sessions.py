@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Multi-process benchmark of session lookups: shared store vs JSON reload
+"""
+import os
+import random
+import tempfile
+import time
+import uuid
+from multiprocessing import get_context
+
+import models.user_session as user_session
+from models.base import DATA
+from models.user_session import UserSession
+
+SESSIONS = 5000
+WORKERS = 4
+SECONDS = 2.0
+
+
+def lookup_shared(session_ids: list) -> int:
+    """Count lookups done through the shared store in SECONDS"""
+    count = 0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        found = UserSession.find_by_session_id(random.choice(session_ids))
+        assert found is not None
+        count += 1
+    return count
+
+
+def lookup_reload(session_ids: list) -> int:
+    """Count lookups done by reloading the JSON file first in SECONDS"""
+    count = 0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        UserSession.load_from_file()
+        found = UserSession.search(
+            {'session_id': random.choice(session_ids)})
+        assert found
+        count += 1
+    return count
+
+
+def run(target, session_ids: list) -> float:
+    """Lookups per second over WORKERS forked processes"""
+    with get_context('fork').Pool(WORKERS) as pool:
+        counts = pool.map(target, [session_ids] * WORKERS)
+    return sum(counts) / SECONDS
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    user_session.SESSION_STORE_PATH = os.path.abspath("sessions.mmap")
+    DATA['UserSession'] = {}
+    session_ids = []
+    for _ in range(SESSIONS):
+        session = UserSession(user_id=str(uuid.uuid4()),
+                              session_id=str(uuid.uuid4()))
+        DATA['UserSession'][session.id] = session
+        session_ids.append(session.session_id)
+    UserSession.save_to_file()
+    store = UserSession._store()
+    for session in DATA['UserSession'].values():
+        session._publish(store)
+
+    shared = run(lookup_shared, session_ids)
+    reload = run(lookup_reload, session_ids)
+    print(f"{WORKERS} workers, {SESSIONS} sessions")
+    print(f"shared store: {shared:12.0f} lookups/s")
+    print(f"JSON reload:  {reload:12.0f} lookups/s")
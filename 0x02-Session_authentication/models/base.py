@@ -2,12 +2,93 @@
 """Base module."""
 import json
 import uuid
+from bisect import bisect_left, bisect_right, insort
 from os import path
 from datetime import datetime
-from typing import TypeVar, List, Iterable, Dict, Optional
+from typing import TypeVar, List, Iterable, Iterator, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional faster encoder
+    orjson = None
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
 DATA: Dict[str, Dict[str, 'Base']] = {}
+INDEXES: Dict[str, Dict[str, 'SortedIndex']] = {}
+JSON_CACHE_ATTR = '_json_cache'
+INDEXED_ATTRIBUTES = ('created_at', 'updated_at')
+INDEX_CHUNK_SIZE = 100
+
+
+def dumps(value) -> bytes:
+    """Encode a value to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+class SortedIndex:
+    """Sorted (value, id) keys of one attribute, for range queries.
+
+    Values are kept to whole seconds, as saved with TIMESTAMP_FORMAT, so
+    keys and cursors stay the same once objects are reloaded from file.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys: List[Tuple[datetime, str]] = []
+        self._values: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed objects."""
+        return len(self._keys)
+
+    def add(self, obj_id: str, value: datetime) -> None:
+        """Index an object, replacing its previous key if any."""
+        self.discard(obj_id)
+        value = value.replace(microsecond=0)
+        insort(self._keys, (value, obj_id))
+        self._values[obj_id] = value
+
+    def discard(self, obj_id: str) -> None:
+        """Remove an object from the index if present."""
+        if obj_id not in self._values:
+            return
+        value = self._values.pop(obj_id)
+        del self._keys[bisect_left(self._keys, (value, obj_id))]
+
+    def rebuild(self, values: Dict[str, datetime]) -> None:
+        """Replace the whole index from an id to value mapping."""
+        self._values = {obj_id: value.replace(microsecond=0)
+                        for obj_id, value in values.items()}
+        self._keys = sorted((value, obj_id)
+                            for obj_id, value in self._values.items())
+
+    def keys(self, start: Optional[datetime] = None,
+             end: Optional[datetime] = None,
+             after: Optional[Tuple[datetime, str]] = None
+             ) -> Iterator[Tuple[datetime, str]]:
+        """Lazily iterate keys with start <= value < end, after a key.
+
+        Keys are read in small chunks and the position is looked up again
+        by bisection before each chunk, so the index may change between
+        two steps of the iteration.
+        """
+        position = 0
+        if start is not None:
+            position = bisect_left(self._keys, (start,))
+        if after is not None:
+            after = (after[0].replace(microsecond=0), after[1])
+            position = max(position, bisect_right(self._keys, after))
+        while True:
+            chunk = self._keys[position:position + INDEX_CHUNK_SIZE]
+            if not chunk:
+                return
+            for key in chunk:
+                if end is not None and key[0] >= end:
+                    return
+                yield key
+            position = bisect_right(self._keys, chunk[-1])
 
 
 class Base:
@@ -25,6 +106,11 @@ class Base:
         self.created_at: datetime = self._parse_datetime(kwargs.get('created_at')) or datetime.utcnow()
         self.updated_at: datetime = self._parse_datetime(kwargs.get('updated_at')) or datetime.utcnow()
 
+    def __setattr__(self, name: str, value) -> None:
+        """Set an attribute, dropping any cached JSON encoding."""
+        self.__dict__.pop(JSON_CACHE_ATTR, None)
+        super().__setattr__(name, value)
+
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """Check if two Base objects are equal."""
         return isinstance(other, Base) and self.id == other.id
@@ -41,14 +127,36 @@ class Base:
         return {
             key: (value.strftime(TIMESTAMP_FORMAT) if isinstance(value, datetime) else value)
             for key, value in self.__dict__.items()
-            if for_serialization or not key.startswith('_')
+            if key != JSON_CACHE_ATTR
+            and (for_serialization or not key.startswith('_'))
         }
 
+    def to_json_bytes(self, for_serialization: bool = False) -> bytes:
+        """Return the JSON encoding of the object, cached until it changes."""
+        cache = self.__dict__.get(JSON_CACHE_ATTR)
+        if cache is None:
+            cache = {}
+            self.__dict__[JSON_CACHE_ATTR] = cache
+        encoded = cache.get(for_serialization)
+        if encoded is None:
+            encoded = dumps(self.to_json(for_serialization))
+            cache[for_serialization] = encoded
+        return encoded
+
     @classmethod
     def _get_file_path(cls) -> str:
         """Generate the file path for storing objects."""
         return f".db_{cls.__name__}.json"
 
+    @classmethod
+    def _indexes(cls) -> Dict[str, SortedIndex]:
+        """Return the sorted indexes of this class by attribute."""
+        class_name = cls.__name__
+        if class_name not in INDEXES:
+            INDEXES[class_name] = {attribute: SortedIndex()
+                                   for attribute in INDEXED_ATTRIBUTES}
+        return INDEXES[class_name]
+
     @classmethod
     def load_from_file(cls) -> None:
         """Load all objects from a file."""
@@ -56,28 +164,40 @@ class Base:
         class_name = cls.__name__
 
         DATA[class_name] = {}
+        for index in cls._indexes().values():
+            index.rebuild({})
         if not path.exists(file_path):
             return
 
-        with open(file_path, 'r') as file:
+        with open(file_path, 'r', encoding='utf-8') as file:
             objects_json = json.load(file)
             for obj_json in objects_json.values():
                 obj = cls(**obj_json)
                 DATA[class_name][obj.id] = obj
 
+        for attribute, index in cls._indexes().items():
+            index.rebuild({obj.id: getattr(obj, attribute)
+                           for obj in DATA[class_name].values()})
+
     @classmethod
     def save_to_file(cls) -> None:
         """Save all objects to a file."""
         file_path = cls._get_file_path()
         class_name = cls.__name__
 
-        with open(file_path, 'w') as file:
-            json.dump({obj.id: obj.to_json(True) for obj in DATA[class_name].values()}, file)
+        records = b','.join(
+            dumps(obj.id) + b':' + obj.to_json_bytes(True)
+            for obj in DATA[class_name].values()
+        )
+        with open(file_path, 'wb') as file:
+            file.write(b'{' + records + b'}')
 
     def save(self) -> None:
         """Save the current object."""
         self.updated_at = datetime.utcnow()
         DATA[self.__class__.__name__][self.id] = self
+        for attribute, index in self.__class__._indexes().items():
+            index.add(self.id, getattr(self, attribute))
         self.__class__.save_to_file()
 
     def remove(self) -> None:
@@ -85,6 +205,8 @@ class Base:
         class_name = self.__class__.__name__
         if self.id in DATA[class_name]:
             del DATA[class_name][self.id]
+            for index in self.__class__._indexes().values():
+                index.discard(self.id)
             self.__class__.save_to_file()
 
     @classmethod
@@ -109,3 +231,22 @@ class Base:
             return all(getattr(obj, key, None) == value for key, value in attributes.items())
         
         return [obj for obj in DATA.get(cls.__name__, {}).values() if matches(obj)]
+
+    @classmethod
+    def search_range(cls, attribute: str,
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     after: Optional[Tuple[datetime, str]] = None
+                     ) -> Iterator[TypeVar('Base')]:
+        """Lazily yield saved objects ordered by an indexed attribute.
+
+        Only objects with start <= value < end are returned; `after` is a
+        (value, id) key to resume from, as used for cursor pagination.
+        """
+        if attribute not in INDEXED_ATTRIBUTES:
+            raise ValueError(f"{attribute} is not indexed")
+        objects = DATA.get(cls.__name__, {})
+        for _, obj_id in cls._indexes()[attribute].keys(start, end, after):
+            obj = objects.get(obj_id)
+            if obj is not None:
+                yield obj
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Shared session store module.
+
+Fixed-slot open addressing hash table in a memory-mapped file, shared by
+every process on the host that opens the same path. Readers never lock:
+each slot carries a sequence number that writers make odd while they
+update the slot, and readers retry until they see the same even number
+before and after reading it. After READ_RETRIES failed attempts, as when
+a writer died halfway, a reader takes the write lock instead.
+
+Writers take an fcntl lock on the header (plus a thread lock, since fcntl
+locks are per process): inserting into an empty slot and turning deleted
+slots back into empty ones both depend on neighbouring slots, so writes
+are serialized. They are logins and logouts, rare next to lookups.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Optional, Tuple
+
+MAGIC = b'USS2'
+HEADER = struct.Struct('<4sII')
+SLOT = struct.Struct('<QB7x64s64s64sd')
+SEQUENCE = struct.Struct('<Q')
+FIELD_SIZE = 64
+DEFAULT_CAPACITY = 65536
+READ_RETRIES = 100
+
+EMPTY = 0
+USED = 1
+DELETED = 2
+
+SessionRecord = Tuple[str, str, float]
+
+
+def _encode(value: str) -> bytes:
+    """Encode a slot string field, rejecting values that do not fit."""
+    encoded = value.encode('utf-8')
+    if len(encoded) > FIELD_SIZE:
+        raise ValueError(f"{value!r} is longer than {FIELD_SIZE} bytes")
+    return encoded
+
+
+def _decode(value: bytes) -> str:
+    """Decode a null-padded slot string field."""
+    return value.rstrip(b'\0').decode('utf-8')
+
+
+class SharedSessionStore:
+    """Session id to (user id, object id, created at) shared table."""
+
+    def __init__(self, file_path: str, capacity: int = DEFAULT_CAPACITY,
+                 max_age: int = 0):
+        """Open the store at file_path, creating it if needed.
+
+        Sessions older than max_age seconds are ignored and their slots
+        reused; 0 keeps them until deleted. The capacity and max_age of an
+        existing store are kept whatever is asked.
+        """
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER.size, 0)
+        try:
+            if os.fstat(self._fd).st_size < HEADER.size:
+                os.ftruncate(self._fd, HEADER.size + capacity * SLOT.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, capacity, max_age), 0)
+            magic, self.capacity, self.max_age = HEADER.unpack(
+                os.pread(self._fd, HEADER.size, 0))
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER.size, 0)
+        if magic != MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"{file_path} is not a session store")
+        self._map = mmap.mmap(self._fd,
+                              HEADER.size + self.capacity * SLOT.size)
+
+    def close(self) -> None:
+        """Unmap the store and close its file."""
+        self._map.close()
+        os.close(self._fd)
+
+    def _offset(self, slot: int) -> int:
+        """Byte offset of a slot in the file."""
+        return HEADER.size + slot * SLOT.size
+
+    def _slots(self, session_id: bytes):
+        """Slot numbers in probing order for a session id."""
+        start = zlib.crc32(session_id) % self.capacity
+        for step in range(self.capacity):
+            yield (start + step) % self.capacity
+
+    def _expired(self, created_at: float) -> bool:
+        """Tell whether a session created at this time has expired."""
+        return bool(self.max_age) and created_at + self.max_age < time.time()
+
+    def _read(self, slot: int) -> tuple:
+        """Consistent snapshot of a slot, locking only as a last resort."""
+        offset = self._offset(slot)
+        for _ in range(READ_RETRIES):
+            fields = SLOT.unpack_from(self._map, offset)
+            if fields[0] % 2 == 0 and \
+                    SEQUENCE.unpack_from(self._map, offset)[0] == fields[0]:
+                return fields[1:]
+            time.sleep(0)
+        return self._locked(self._read_locked, slot)
+
+    def _read_locked(self, slot: int) -> tuple:
+        """Snapshot of a slot; the caller holds the write lock.
+
+        An odd sequence under the lock means its writer died halfway, so
+        the slot is reported as deleted: probing goes on past it and the
+        next write there overwrites it.
+        """
+        fields = SLOT.unpack_from(self._map, self._offset(slot))
+        if fields[0] % 2:
+            return DELETED, b'', b'', b'', 0.0
+        return fields[1:]
+
+    def _write(self, slot: int, state: int, session_id: bytes = b'',
+               user_id: bytes = b'', obj_id: bytes = b'',
+               created_at: float = 0.0) -> None:
+        """Overwrite a slot; the caller holds the write lock."""
+        offset = self._offset(slot)
+        sequence = SEQUENCE.unpack_from(self._map, offset)[0]
+        odd = sequence + 1 if sequence % 2 == 0 else sequence + 2
+        SEQUENCE.pack_into(self._map, offset, odd)
+        SLOT.pack_into(self._map, offset, odd, state,
+                       session_id, user_id, obj_id, created_at)
+        SEQUENCE.pack_into(self._map, offset, odd + 1)
+
+    def _locked(self, function, *args):
+        """Call function with the write lock held."""
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER.size, 0)
+            try:
+                return function(*args)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER.size, 0)
+
+    def _clear_deleted(self, slot: int) -> None:
+        """Turn the deleted slots ending at slot back into empty ones.
+
+        Only done when the slot after them is empty: no probe sequence can
+        go past an empty slot, so none needs the deleted ones any more.
+        """
+        if self._read_locked((slot + 1) % self.capacity)[0] != EMPTY:
+            return
+        for _ in range(self.capacity):
+            if self._read_locked(slot)[0] != DELETED:
+                return
+            self._write(slot, EMPTY)
+            slot = (slot - 1) % self.capacity
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Return (user id, object id, created at) of a session, or None."""
+        if not session_id or len(session_id.encode('utf-8')) > FIELD_SIZE:
+            return None
+        key = _encode(session_id)
+        for slot in self._slots(key):
+            state, found, user_id, obj_id, created_at = self._read(slot)
+            if state == EMPTY:
+                return None
+            if state == USED and found.rstrip(b'\0') == key:
+                if self._expired(created_at):
+                    return None
+                return _decode(user_id), _decode(obj_id), created_at
+        return None
+
+    def set(self, session_id: str, user_id: str, obj_id: str,
+            created_at: float) -> bool:
+        """Store a session, returning False when the store is full."""
+        key = _encode(session_id)
+        record = (key, _encode(user_id), _encode(obj_id), created_at)
+
+        def insert() -> bool:
+            free = None
+            for slot in self._slots(key):
+                state, found, _, _, found_at = self._read_locked(slot)
+                if state == USED and found.rstrip(b'\0') == key:
+                    self._write(slot, USED, *record)
+                    return True
+                reusable = state == DELETED or \
+                    state == USED and self._expired(found_at)
+                if reusable and free is None:
+                    free = slot
+                if state == EMPTY:
+                    break
+            else:
+                if free is None:
+                    return False
+            self._write(slot if free is None else free, USED, *record)
+            return True
+
+        return self._locked(insert)
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session, returning whether it was stored."""
+        if not session_id or len(session_id.encode('utf-8')) > FIELD_SIZE:
+            return False
+        key = _encode(session_id)
+
+        def remove() -> bool:
+            for slot in self._slots(key):
+                state, found = self._read_locked(slot)[:2]
+                if state == EMPTY:
+                    return False
+                if state == USED and found.rstrip(b'\0') == key:
+                    self._write(slot, DELETED)
+                    self._clear_deleted(slot)
+                    return True
+            return False
+
+        return self._locked(remove)
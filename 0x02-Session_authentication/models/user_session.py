@@ -1,7 +1,18 @@
 #!/usr/bin/env python3
 """User session module."""
-from models.base import Base
-from typing import Optional
+import logging
+import os
+from datetime import datetime, timezone
+from models.base import Base, TIMESTAMP_FORMAT
+from models.session_store import SharedSessionStore
+from typing import Optional, Set
+
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH")
+SESSION_DURATION = int(os.getenv("SESSION_DURATION") or 0)
+_STORE: Optional[SharedSessionStore] = None
+_UNSTORED: Set[str] = set()
+
+logger = logging.getLogger(__name__)
 
 
 class UserSession(Base):
@@ -12,3 +23,73 @@ class UserSession(Base):
         super().__init__(*args, **kwargs)
         self.user_id: Optional[str] = kwargs.get('user_id')
         self.session_id: Optional[str] = kwargs.get('session_id')
+
+    @staticmethod
+    def _store() -> Optional[SharedSessionStore]:
+        """Return the store shared by all workers, if it is configured."""
+        global _STORE
+        if _STORE is None and SESSION_STORE_PATH:
+            _STORE = SharedSessionStore(SESSION_STORE_PATH,
+                                        max_age=SESSION_DURATION)
+        return _STORE
+
+    def _publish(self, store: SharedSessionStore) -> None:
+        """Copy the session into the shared store."""
+        if not self.session_id or not self.user_id:
+            return
+        created_at = self.created_at.replace(tzinfo=timezone.utc)
+        if store.set(self.session_id, self.user_id, self.id,
+                     created_at.timestamp()):
+            _UNSTORED.discard(self.session_id)
+        else:
+            _UNSTORED.add(self.session_id)
+            logger.warning("Session store %s is full, session %s is only "
+                           "visible to this worker", SESSION_STORE_PATH,
+                           self.id)
+
+    @classmethod
+    def load_from_file(cls) -> None:
+        """Load all sessions from a file, backfilling the shared store."""
+        super().load_from_file()
+        store = cls._store()
+        if store is not None:
+            for session in cls.all():
+                session._publish(store)
+
+    def save(self) -> None:
+        """Save the session, publishing it to the shared store."""
+        super().save()
+        store = self._store()
+        if store is not None:
+            self._publish(store)
+
+    def remove(self) -> None:
+        """Remove the session, withdrawing it from the shared store."""
+        super().remove()
+        _UNSTORED.discard(self.session_id)
+        store = self._store()
+        if store is not None and self.session_id:
+            store.delete(self.session_id)
+
+    @classmethod
+    def find_by_session_id(cls, session_id: str) -> Optional['UserSession']:
+        """Return the session with this session ID, as seen by any worker.
+
+        Sessions the shared store could not take are looked up in this
+        worker's own data instead.
+        """
+        store = cls._store()
+        if store is None or session_id in _UNSTORED:
+            sessions = cls.search({'session_id': session_id})
+            return sessions[0] if sessions else None
+        record = store.get(session_id)
+        if record is None:
+            return None
+        user_id, obj_id, created_at = record
+        session = cls.get(obj_id)
+        if session is not None:
+            return session
+        created_at = datetime.fromtimestamp(created_at, timezone.utc) \
+            .strftime(TIMESTAMP_FORMAT)
+        return cls(id=obj_id, user_id=user_id, session_id=session_id,
+                   created_at=created_at, updated_at=created_at)
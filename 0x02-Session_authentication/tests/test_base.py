@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests of the sorted indexes of Base."""
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from models.base import DATA
+from models.user import User
+
+
+class TestSearchRange(unittest.TestCase):
+    """Tests of Base.search_range."""
+
+    def setUp(self):
+        """Save users in a fresh directory."""
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        DATA['User'] = {}
+        User.load_from_file()
+        self.users = {}
+        for email, microsecond in (('a', 100), ('b', 500), ('c', 900)):
+            user = User(email=email)
+            user.save()
+            user.created_at = datetime(2024, 1, 1, 0, 0, 0, microsecond)
+            user.save()
+            self.users[email] = user
+
+    def tearDown(self):
+        """Drop the users and their directory."""
+        DATA['User'] = {}
+        User.load_from_file()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def page_after(self, email: str) -> list:
+        """Emails of the users after the cursor of one user."""
+        user = self.users[email]
+        after = (user.created_at, user.id)
+        return sorted(user.email for user in
+                      User.search_range('created_at', after=after))
+
+    def test_range(self):
+        """Users are returned between two timestamps."""
+        users = User.search_range('created_at',
+                                  start=datetime(2024, 1, 1),
+                                  end=datetime(2024, 1, 1, 0, 0, 1))
+        self.assertEqual(sorted(user.email for user in users),
+                         ['a', 'b', 'c'])
+        self.assertEqual(list(User.search_range(
+            'created_at', start=datetime(2024, 1, 1, 0, 0, 1))), [])
+
+    def test_cursor_across_reload(self):
+        """A cursor resumes at the same place once users are reloaded."""
+        cursor = self.users['a'].id
+        expected = sorted(user.email for user in self.users.values()
+                          if user.id > cursor)
+        self.assertEqual(self.page_after('a'), expected)
+        User.load_from_file()
+        self.users = {user.email: user for user in User.all()}
+        self.assertEqual(self.page_after('a'), expected)
+
+    def test_unindexed_attribute(self):
+        """Only indexed attributes can be ranged over."""
+        with self.assertRaises(ValueError):
+            list(User.search_range('email'))
+
+
+if __name__ == "__main__":
+    unittest.main()
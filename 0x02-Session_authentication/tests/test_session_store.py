@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests of the shared session store."""
+import os
+import tempfile
+import time
+import unittest
+from multiprocessing import get_context
+
+from models.session_store import (EMPTY, SEQUENCE, SharedSessionStore)
+
+
+def _fill(file_path: str, worker: int) -> None:
+    """Store 200 sessions of one worker."""
+    store = SharedSessionStore(file_path)
+    for i in range(200):
+        assert store.set(f"{worker}-{i}", f"user-{worker}", f"obj-{i}",
+                         float(i))
+    store.close()
+
+
+class TestSharedSessionStore(unittest.TestCase):
+    """Tests of SharedSessionStore."""
+
+    def setUp(self):
+        """Open a store in a fresh directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "sessions")
+        self.store = SharedSessionStore(self.file_path, capacity=8)
+
+    def tearDown(self):
+        """Close the store and drop its directory."""
+        self.store.close()
+        self.directory.cleanup()
+
+    def states(self) -> list:
+        """State of every slot."""
+        return [self.store._read(slot)[0]
+                for slot in range(self.store.capacity)]
+
+    def test_set_get(self):
+        """Stored sessions are found, unknown ones are not."""
+        self.assertTrue(self.store.set("abc", "user", "obj", 1.0))
+        self.assertEqual(self.store.get("abc"), ("user", "obj", 1.0))
+        self.assertIsNone(self.store.get("def"))
+        self.assertIsNone(self.store.get(""))
+        self.assertIsNone(self.store.get("x" * 100))
+
+    def test_set_overwrites(self):
+        """Storing a session again replaces it in place."""
+        self.store.set("abc", "user", "obj", 1.0)
+        self.store.set("abc", "other", "obj", 2.0)
+        self.assertEqual(self.store.get("abc"), ("other", "obj", 2.0))
+        self.assertEqual(self.states().count(EMPTY), 7)
+
+    def test_too_long(self):
+        """Fields longer than a slot are rejected."""
+        with self.assertRaises(ValueError):
+            self.store.set("abc", "u" * 65, "obj", 1.0)
+
+    def test_delete(self):
+        """Deleted sessions are gone and their slots empty again."""
+        self.store.set("abc", "user", "obj", 1.0)
+        self.assertTrue(self.store.delete("abc"))
+        self.assertFalse(self.store.delete("abc"))
+        self.assertIsNone(self.store.get("abc"))
+        self.assertEqual(self.states(), [EMPTY] * 8)
+
+    def test_churn_keeps_empty_slots(self):
+        """Logins and logouts never use up every empty slot."""
+        for i in range(100):
+            self.store.set(f"a{i}", "user", "obj", 1.0)
+            self.store.set(f"b{i}", "user", "obj", 1.0)
+            self.store.delete(f"a{i}")
+            self.store.delete(f"b{i}")
+        self.assertEqual(self.states(), [EMPTY] * 8)
+
+    def test_full(self):
+        """A full store refuses new sessions and keeps the others."""
+        for i in range(8):
+            self.assertTrue(self.store.set(f"s{i}", "user", "obj", 1.0))
+        self.assertFalse(self.store.set("new", "user", "obj", 1.0))
+        self.assertIsNone(self.store.get("new"))
+        self.assertEqual(self.store.get("s3"), ("user", "obj", 1.0))
+        self.store.delete("s3")
+        self.assertTrue(self.store.set("new", "user", "obj", 1.0))
+        self.assertEqual(self.store.get("new"), ("user", "obj", 1.0))
+
+    def test_expiry(self):
+        """Expired sessions are not found and their slots are reused."""
+        store = SharedSessionStore(
+            os.path.join(self.directory.name, "expiring"), capacity=2,
+            max_age=60)
+        store.set("old", "user", "obj", time.time() - 120)
+        store.set("new", "user", "obj", time.time())
+        self.assertIsNone(store.get("old"))
+        self.assertTrue(store.set("newer", "user", "obj", time.time()))
+        self.assertIsNotNone(store.get("new"))
+        self.assertIsNotNone(store.get("newer"))
+        store.close()
+
+    def test_dead_writer(self):
+        """A slot left odd by a dead writer neither hangs nor sticks."""
+        self.store.set("abc", "user", "obj", 1.0)
+        slot = next(slot for slot in range(8)
+                    if self.store._read(slot)[0] != EMPTY)
+        offset = self.store._offset(slot)
+        sequence = SEQUENCE.unpack_from(self.store._map, offset)[0]
+        SEQUENCE.pack_into(self.store._map, offset, sequence + 1)
+
+        self.assertIsNone(self.store.get("abc"))
+        self.assertTrue(self.store.set("abc", "user", "obj", 2.0))
+        self.assertEqual(self.store.get("abc"), ("user", "obj", 2.0))
+        sequence = SEQUENCE.unpack_from(self.store._map, offset)[0]
+        self.assertEqual(sequence % 2, 0)
+
+    def test_concurrent_writers(self):
+        """Sessions written by several processes are all visible."""
+        file_path = os.path.join(self.directory.name, "shared")
+        SharedSessionStore(file_path, capacity=2048).close()
+        context = get_context('fork')
+        workers = [context.Process(target=_fill, args=(file_path, worker))
+                   for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        store = SharedSessionStore(file_path)
+        for worker in range(4):
+            for i in range(200):
+                self.assertEqual(store.get(f"{worker}-{i}"),
+                                 (f"user-{worker}", f"obj-{i}", float(i)))
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests of UserSession with the shared session store."""
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import models.user_session as user_session
+from models.base import DATA
+from models.user_session import UserSession
+
+
+class TestUserSessionStore(unittest.TestCase):
+    """Tests of UserSession lookups through the shared store."""
+
+    def setUp(self):
+        """Use a fresh store, a 1 hour duration and a non-UTC timezone."""
+        self.cwd = os.getcwd()
+        self.tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Asia/Tokyo'
+        time.tzset()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.settings = (user_session.SESSION_STORE_PATH,
+                         user_session.SESSION_DURATION)
+        user_session.SESSION_STORE_PATH = os.path.abspath("sessions")
+        user_session.SESSION_DURATION = 3600
+        user_session._STORE = None
+        DATA['UserSession'] = {}
+
+    def tearDown(self):
+        """Restore the timezone, settings and directory."""
+        UserSession._store().close()
+        user_session._STORE = None
+        (user_session.SESSION_STORE_PATH,
+         user_session.SESSION_DURATION) = self.settings
+        DATA['UserSession'] = {}
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+        if self.tz is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = self.tz
+        time.tzset()
+
+    def test_fresh_session_found(self):
+        """A session saved just now has not expired."""
+        session = UserSession(user_id="user", session_id="abc")
+        session.save()
+        self.assertIs(UserSession.find_by_session_id("abc"), session)
+
+    def test_old_session_expired(self):
+        """A session older than SESSION_DURATION is not found."""
+        created_at = datetime.utcnow() - timedelta(hours=2)
+        UserSession(user_id="user", session_id="abc",
+                    created_at=created_at.strftime("%Y-%m-%dT%H:%M:%S")
+                    ).save()
+        self.assertIsNone(UserSession.find_by_session_id("abc"))
+
+    def test_other_worker_session(self):
+        """A session saved by another worker keeps its UTC creation time."""
+        session = UserSession(user_id="user", session_id="abc")
+        session.save()
+        del DATA['UserSession'][session.id]
+        found = UserSession.find_by_session_id("abc")
+        self.assertEqual(found.id, session.id)
+        self.assertEqual(found.created_at,
+                         session.created_at.replace(microsecond=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
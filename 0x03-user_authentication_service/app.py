@@ -2,14 +2,66 @@
 """
 Flask application for user authentication service
 """
-from flask import Flask, jsonify, request, abort, redirect
+from flask import (Blueprint, Flask, jsonify, request, abort, redirect,
+                   current_app)
 from auth import Auth
+from db import DB
+from typing import Optional
+import os
+import profiler
 
-app = Flask(__name__)
-AUTH = Auth()
+DEFAULT_CONFIG = {
+    "DATABASE_URL": "sqlite:///a.db",
+    "DB_RESET": False,
+    "WARM_UP": False,
+    "PROFILER_TOKEN": None,
+}
 
+views = Blueprint('auth_service', __name__)
 
-@app.route('/', methods=['GET'])
+
+def _auth() -> Auth:
+    """
+    Auth instance of the current application
+
+    Returns:
+        Auth: The application's Auth object
+    """
+    return current_app.extensions['auth']
+
+
+def create_app(config: Optional[dict] = None) -> Flask:
+    """
+    Create the Flask application
+
+    The database engine and schema are set up on first use, or right away
+    when WARM_UP is set. Warming up in the master process before forking
+    workers is safe: pooled connections are released afterwards. DB_RESET
+    drops existing tables on that first setup, so it is only meant for a
+    single process or a warm-up done once before forking.
+
+    Args:
+        config (dict): Overrides for DEFAULT_CONFIG
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    auth = Auth(DB(app.config["DATABASE_URL"], app.config["DB_RESET"]))
+    app.extensions['auth'] = auth
+    app.register_blueprint(views)
+    profiler.init_app(app)
+
+    if app.config["WARM_UP"]:
+        auth.warm_up()
+    return app
+
+
+@views.route('/', methods=['GET'])
 def home():
     """
     Home route
@@ -20,7 +72,7 @@ def home():
     return jsonify({"message": "Bienvenue"})
 
 
-@app.route('/users', methods=['POST'])
+@views.route('/users', methods=['POST'])
 def users():
     """
     User registration endpoint
@@ -32,13 +84,13 @@ def users():
     password = request.form.get('password')
 
     try:
-        user = AUTH.register_user(email, password)
+        user = _auth().register_user(email, password)
         return jsonify({"email": user.email, "message": "user created"})
     except ValueError:
         return jsonify({"message": "email already registered"}), 400
 
 
-@app.route('/sessions', methods=['POST'])
+@views.route('/sessions', methods=['POST'])
 def login():
     """
     User login endpoint
@@ -49,31 +101,31 @@ def login():
     email = request.form.get('email')
     password = request.form.get('password')
 
-    if not AUTH.valid_login(email, password):
+    if not _auth().valid_login(email, password):
         abort(401)
 
-    session_id = AUTH.create_session(email)
+    session_id = _auth().create_session(email)
     response = jsonify({"email": email, "message": "logged in"})
     response.set_cookie('session_id', session_id)
     return response
 
 
-@app.route('/sessions', methods=['DELETE'])
+@views.route('/sessions', methods=['DELETE'])
 def logout():
     """
     User logout endpoint
     """
     session_id = request.cookies.get('session_id')
-    user = AUTH.get_user_from_session_id(session_id)
+    user = _auth().get_user_from_session_id(session_id)
 
     if not user:
         abort(403)
 
-    AUTH.destroy_session(user.id)
+    _auth().destroy_session(user.id)
     return redirect('/')
 
 
-@app.route('/profile', methods=['GET'])
+@views.route('/profile', methods=['GET'])
 def profile():
     """
     User profile endpoint
@@ -82,7 +134,7 @@ def profile():
         JSON payload with user email
     """
     session_id = request.cookies.get('session_id')
-    user = AUTH.get_user_from_session_id(session_id)
+    user = _auth().get_user_from_session_id(session_id)
 
     if not user:
         abort(403)
@@ -90,7 +142,7 @@ def profile():
     return jsonify({"email": user.email})
 
 
-@app.route('/reset_password', methods=['POST'])
+@views.route('/reset_password', methods=['POST'])
 def get_reset_password_token():
     """
     Generate reset password token endpoint
@@ -101,13 +153,13 @@ def get_reset_password_token():
     email = request.form.get('email')
 
     try:
-        reset_token = AUTH.get_reset_password_token(email)
+        reset_token = _auth().get_reset_password_token(email)
         return jsonify({"email": email, "reset_token": reset_token})
     except ValueError:
         abort(403)
 
 
-@app.route('/reset_password', methods=['PUT'])
+@views.route('/reset_password', methods=['PUT'])
 def update_password():
     """
     Update user password endpoint
@@ -120,11 +172,18 @@ def update_password():
     new_password = request.form.get('new_password')
 
     try:
-        AUTH.update_password(reset_token, new_password)
+        _auth().update_password(reset_token, new_password)
         return jsonify({"email": email, "message": "Password updated"})
     except ValueError:
         abort(403)
 
 
+app = create_app({
+    "DB_RESET": os.getenv("DB_RESET") == "1",
+    "WARM_UP": os.getenv("WARM_UP") == "1",
+})
+AUTH = app.extensions['auth']
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port="5000")
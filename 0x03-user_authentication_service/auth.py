@@ -5,8 +5,9 @@ Authentication module for user authentication service
 import bcrypt
 import uuid
 from db import DB
+from sqlalchemy.orm.exc import NoResultFound
 from user import User
-from typing import Union
+from typing import Optional, Union
 
 
 def _hash_password(password: str) -> bytes:
@@ -35,9 +36,18 @@ def _generate_uuid() -> str:
 class Auth:
     """Auth class to interact with the authentication database"""
 
-    def __init__(self):
-        """Initialize the Auth object"""
-        self._db = DB()
+    def __init__(self, db: Optional[DB] = None):
+        """
+        Initialize the Auth object
+
+        Args:
+            db (DB): Database to use, a default lazily-initialized DB if None
+        """
+        self._db = db if db is not None else DB()
+
+    def warm_up(self) -> None:
+        """Set up the database ahead of the first request"""
+        self._db.warm_up()
 
     def register_user(self, email: str, password: str) -> User:
         """
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the user authentication service
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+RUNS = 10
+
+COLD_START = """
+import time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({config!r})
+created = time.perf_counter()
+app.test_client().post('/sessions', data={{'email': 'a@b.c',
+                                          'password': 'x'}})
+first_request = time.perf_counter()
+warm_app = create_app(dict({warm_config!r}, WARM_UP=True))
+warmed = time.perf_counter()
+warm_app.test_client().post('/sessions', data={{'email': 'a@b.c',
+                                               'password': 'x'}})
+warm_request = time.perf_counter()
+print(imported - start, created - imported, first_request - created,
+      warmed - first_request, warm_request - warmed)
+"""
+
+
+def cold_start(config: dict, warm_config: dict) -> list:
+    """
+    Time one cold start in a fresh interpreter
+
+    The first request looks a user up, so it pays for the deferred engine
+    and schema setup; a second app, on its own fresh database, then does
+    that setup in create_app instead.
+
+    Returns:
+        list: import, lazy create_app, first DB request, warm create_app
+        and warm first DB request times in seconds
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.check_output(
+        [sys.executable, "-c",
+         COLD_START.format(config=config, warm_config=warm_config)],
+        cwd=here, env=env, text=True)
+    return [float(value) for value in output.split()]
+
+
+if __name__ == "__main__":
+    samples = []
+    for _ in range(RUNS):
+        directory = tempfile.mkdtemp()
+        samples.append(cold_start(
+            {"DATABASE_URL": f"sqlite:///{directory}/lazy.db"},
+            {"DATABASE_URL": f"sqlite:///{directory}/warm.db"}))
+    labels = ["import app", "create_app", "first DB request",
+              "warm create_app", "warm DB request"]
+    for label, values in zip(labels, zip(*samples)):
+        print(f"{label:>16}: {min(values) * 1e3:8.2f} ms "
+              f"(median {sorted(values)[len(values) // 2] * 1e3:.2f} ms)")
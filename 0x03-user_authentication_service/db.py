@@ -2,7 +2,10 @@
 """
 DB module for user authentication service
 """
+import threading
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
@@ -15,21 +18,63 @@ from user import Base, User
 class DB:
     """DB class for handling database operations"""
 
-    def __init__(self) -> None:
-        """Initialize a new DB instance"""
-        self._engine = create_engine("sqlite:///a.db", echo=False)
-        Base.metadata.drop_all(self._engine)
-        Base.metadata.create_all(self._engine)
+    def __init__(self, url: str = "sqlite:///a.db",
+                 reset: bool = True) -> None:
+        """
+        Initialize a new DB instance
+
+        The engine and schema are only set up on first use or warm_up().
+        reset defaults to True on purpose, keeping the original behaviour
+        of a bare DB() starting from empty tables; the tables are dropped
+        at that first use rather than here. Pass reset=False to keep
+        existing data, as create_app does unless DB_RESET is set.
+
+        Args:
+            url (str): SQLAlchemy database URL
+            reset (bool): Drop existing tables before creating the schema
+        """
+        self._url = url
+        self._reset = reset
+        self._lock = threading.RLock()
+        self.__engine = None
         self.__session = None
 
+    @property
+    def _engine(self) -> Engine:
+        """Memoized engine, created along with the schema on first use"""
+        if self.__engine is None:
+            with self._lock:
+                if self.__engine is None:
+                    engine = create_engine(self._url, echo=False)
+                    if self._reset:
+                        Base.metadata.drop_all(engine)
+                    Base.metadata.create_all(engine)
+                    self.__engine = engine
+        return self.__engine
+
     @property
     def _session(self) -> Session:
         """Memoized session object"""
         if self.__session is None:
-            DBSession = sessionmaker(bind=self._engine)
-            self.__session = DBSession()
+            with self._lock:
+                if self.__session is None:
+                    DBSession = sessionmaker(bind=self._engine)
+                    self.__session = DBSession()
         return self.__session
 
+    def warm_up(self) -> None:
+        """
+        Create the engine and schema ahead of the first request
+
+        Pooled connections are released afterwards so that worker
+        processes forked from this one never share a connection.
+        """
+        with self._lock:
+            if self.__session is not None:
+                self.__session.close()
+                self.__session = None
+            self._engine.dispose()
+
     def add_user(self, email: str, hashed_password: str) -> User:
         """
         Add a new user to the database